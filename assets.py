@@ -1,7 +1,10 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+
 import pygame
+from chess.pieces import Pawn, Rook, Knight, Bishop, Queen, King
 from constants import (
     ASSET_PIECE_DIR, ASSET_AUDIO_DIR, ASSET_FONT_PATH,
-    PIECE_NAMES, PIECE_WIDTH, PIECE_HEIGHT, FONT_SCALE,
+    PIECE_WIDTH, PIECE_HEIGHT, FONT_SCALE, ALPHA_DRAG_PIECE,
 )
 
 _SOUND_NAMES = ["move", "capture", "check", "castle", "promote", "illegal", "game-start", "game-end"]
@@ -10,44 +13,67 @@ _SOUND_NAMES = ["move", "capture", "check", "castle", "promote", "illegal", "gam
 class AssetManager:
     def __init__(self):
         self.pieces: dict[str, pygame.Surface] = {}
+        self._drag_sprites: dict[str, pygame.Surface] = {}
         self.sounds: dict[str, pygame.mixer.Sound] = {}
+        self._sound_futures: dict[str, Future] = {}
         self.font_sheet: pygame.Surface | None = None
         self._load_pieces()
         self._load_audio()
         self._load_font()
 
     def _load_pieces(self) -> None:
+        # One placeholder shared by every missing sprite; nothing draws onto it.
+        missing = pygame.Surface((PIECE_WIDTH, PIECE_HEIGHT), pygame.SRCALPHA)
+        missing.fill((255, 0, 255, 200))
+        missing = missing.convert_alpha()
         for color in ("white", "black"):
-            for cls, name in PIECE_NAMES.items():
-                key = f"{color}_{name}"
+            for cls in (Pawn, Rook, Knight, Bishop, Queen, King):
+                key = f"{color}_{cls.NAME}"
                 path = f"{ASSET_PIECE_DIR}/{key}.png"
                 try:
                     raw = pygame.image.load(path).convert_alpha()
-                    self.pieces[key] = pygame.transform.scale(raw, (PIECE_WIDTH, PIECE_HEIGHT))
+                    scaled = pygame.transform.scale(raw, (PIECE_WIDTH, PIECE_HEIGHT))
+                    self.pieces[key] = scaled.convert_alpha()
                 except FileNotFoundError:
-                    surf = pygame.Surface((PIECE_WIDTH, PIECE_HEIGHT), pygame.SRCALPHA)
-                    surf.fill((255, 0, 255, 200))
-                    self.pieces[key] = surf
+                    self.pieces[key] = missing
 
     def _load_audio(self) -> None:
+        # Decode in the background so the first frame isn't held up by MP3s;
+        # play() waits on a sound only the first time it is needed.
+        pool = ThreadPoolExecutor(max_workers=4)
         for name in _SOUND_NAMES:
-            try:
-                self.sounds[name] = pygame.mixer.Sound(f"{ASSET_AUDIO_DIR}/{name}.mp3")
-            except FileNotFoundError:
-                pass
+            path = f"{ASSET_AUDIO_DIR}/{name}.mp3"
+            self._sound_futures[name] = pool.submit(pygame.mixer.Sound, path)
+        pool.shutdown(wait=False)
 
     def _load_font(self) -> None:
         try:
             raw = pygame.image.load(ASSET_FONT_PATH).convert_alpha()
             w, h = raw.get_width() * FONT_SCALE, raw.get_height() * FONT_SCALE
-            self.font_sheet = pygame.transform.scale(raw, (w, h))
+            self.font_sheet = pygame.transform.scale(raw, (w, h)).convert_alpha()
         except FileNotFoundError:
             self.font_sheet = None
 
     def get_piece_sprite(self, piece) -> pygame.Surface:
-        return self.pieces[f"{piece.color}_{PIECE_NAMES[type(piece)]}"]
+        return self.pieces[piece.sprite_key]
+
+    def get_drag_sprite(self, piece) -> pygame.Surface:
+        """Translucent copy of the piece's sprite, made on first drag and kept."""
+        sprite = self._drag_sprites.get(piece.sprite_key)
+        if sprite is None:
+            sprite = self.pieces[piece.sprite_key].copy()
+            sprite.set_alpha(ALPHA_DRAG_PIECE)
+            self._drag_sprites[piece.sprite_key] = sprite
+        return sprite
 
     def play(self, name: str) -> None:
         sound = self.sounds.get(name)
-        if sound:
-            sound.play()
+        if sound is None:
+            future = self._sound_futures.pop(name, None)
+            if future is None:
+                return
+            try:
+                sound = self.sounds[name] = future.result()
+            except FileNotFoundError:
+                return
+        sound.play()
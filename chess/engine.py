@@ -1,17 +1,36 @@
-from .pieces import Pawn, Rook, Knight, Bishop, Queen, King
+from collections.abc import Iterator
+
+from .pieces import (
+    Piece, Pawn, Rook, Knight, Bishop, Queen, King, PAWN, ROOK, KING,
+    WK, WQ, BK, BQ,
+    KNIGHT_ATTACKS, KING_ATTACKS, PAWN_ATTACKS, BETWEEN, LINE,
+    rook_attacks, bishop_attacks, squares,
+)
 
 WHITE = "white"
 BLACK = "black"
 
 _BACK_RANK = [Rook, Knight, Bishop, Queen, King, Bishop, Knight, Rook]
 _PROMOTION_PIECES = {"queen": Queen, "rook": Rook, "bishop": Bishop, "knight": Knight}
+# Castling right tied to each rook's home corner: h1, a1, h8, a8.
+_CORNER_RIGHTS = {63: WK, 56: WQ, 7: BK, 0: BQ}
+
+
+def _bb_key(piece) -> str:
+    return f"{piece.color}_{piece.SYMBOL}"
 
 
 class ChessEngine:
     def __init__(self):
-        self.board: list[list] = []
+        self.board: list = []
+        self.bb: dict[str, int] = {}
+        self.occ_white: int = 0
+        self.occ_black: int = 0
+        self.occ: int = 0
+        self._pins: dict[str, tuple[int, int, int]] = {}
+        self._legal_cache: dict[int, int] = {}
         self.turn: str = WHITE
-        self.castling_rights: dict = {}
+        self.castling_mask: int = 0
         self.en_passant_target: tuple[int, int] | None = None
         self.promotion_pending: tuple[int, int] | None = None
         self.move_log: list[dict] = []
@@ -19,174 +38,362 @@ class ChessEngine:
 
     def reset(self):
         self.board = self._build_starting_board()
+        self._sync_bitboards()
         self.turn = WHITE
         self.en_passant_target = None
         self.promotion_pending = None
         self.move_log = []
-        self.castling_rights = {
-            WHITE: {"kingside": True, "queenside": True},
-            BLACK: {"kingside": True, "queenside": True},
-        }
+        self.castling_mask = WK | WQ | BK | BQ
 
-    def _build_starting_board(self) -> list[list]:
-        board = [[None] * 8 for _ in range(8)]
+    def _build_starting_board(self) -> list:
+        board = [None] * 64
         for col, cls in enumerate(_BACK_RANK):
-            board[0][col] = cls(BLACK)
-            board[7][col] = cls(WHITE)
+            board[col] = cls(BLACK)
+            board[56 + col] = cls(WHITE)
         for col in range(8):
-            board[1][col] = Pawn(BLACK)
-            board[6][col] = Pawn(WHITE)
+            board[8 + col] = Pawn(BLACK)
+            board[48 + col] = Pawn(WHITE)
         return board
 
-    def get_piece(self, row: int, col: int):
-        return self.board[row][col]
+    def get_piece(self, row: int, col: int) -> Piece | None:
+        return self.board[row * 8 + col]
+
+    def iter_pieces(self) -> Iterator[tuple[int, int, Piece]]:
+        """Yield (row, col, piece) for each occupied square in square order, a8 first."""
+        board = self.board
+        occ = self.occ
+        while occ:
+            lsb = occ & -occ
+            sq = lsb.bit_length() - 1
+            yield sq >> 3, sq & 7, board[sq]
+            occ ^= lsb
+
+    def set_piece(self, row: int, col: int, piece: Piece | None) -> None:
+        self._place(row * 8 + col, piece)
+        self._position_changed()
+
+    def clear_board(self) -> None:
+        self.board = [None] * 64
+        self.castling_mask = 0
+        self.en_passant_target = None
+        self.promotion_pending = None
+        self._sync_bitboards()
 
     def get_legal_moves(self, row: int, col: int) -> list[tuple[int, int]]:
-        piece = self.board[row][col]
+        sq = row * 8 + col
+        piece = self.board[sq]
         if piece is None or piece.color != self.turn:
             return []
-        return [m for m in piece.get_moves(self, row, col) if not self._causes_check(row, col, m)]
+        return squares(self._cached_legal_moves_bb(sq))
 
     def move_piece(self, start: tuple[int, int], end: tuple[int, int]) -> dict:
         sr, sc = start
         er, ec = end
-        piece = self.board[sr][sc]
+        piece = self.board[sr * 8 + sc]
 
         self.move_log.append(self._log_entry(start, end, piece))
         self._apply_move(start, end, piece)
-        self._update_castling_rights(piece, start)
+        self._update_castling_rights(piece, start, end)
         self._update_en_passant(piece, start, end)
         self.turn = BLACK if self.turn == WHITE else WHITE
+        self._position_changed()
 
-        if isinstance(piece, Pawn) and er == (0 if piece.color == WHITE else 7):
+        if piece.KIND == PAWN and er == (0 if piece.color == WHITE else 7):
             self.promotion_pending = (er, ec)
             return {"promotion_required": True, "promotion_square": (er, ec)}
 
         return {"promotion_required": False, "promotion_square": None}
 
     def promote_pawn(self, row: int, col: int, piece_type: str) -> None:
-        cls = _PROMOTION_PIECES.get(piece_type.lower())
+        cls = _PROMOTION_PIECES.get(piece_type)
         if cls is None:
             raise ValueError(f"Invalid promotion piece: '{piece_type}'")
-        color = self.board[row][col].color
-        self.board[row][col] = cls(color)
+        color = self.board[row * 8 + col].color
+        self.set_piece(row, col, cls(color))
         self.promotion_pending = None
 
     def is_in_check(self, color: str) -> bool:
-        king_sq = self._find_king(color)
         opponent = BLACK if color == WHITE else WHITE
-        return any(
-            king_sq in self.board[r][c].get_moves(self, r, c)
-            for r in range(8)
-            for c in range(8)
-            if self.board[r][c] is not None and self.board[r][c].color == opponent
-        )
+        return self.attackers_to(self._find_king(color), opponent, self.occ)
+
+    def attackers_to(self, sq: int, color: str, occ: int) -> bool:
+        """Whether any of color's pieces attacks sq, sliders being blocked by occ."""
+        bb = self.bb
+        # Cheapest and most common hits first.
+        if PAWN_ATTACKS[BLACK if color == WHITE else WHITE][sq] & bb[f"{color}_P"]:
+            return True
+        if KNIGHT_ATTACKS[sq] & bb[f"{color}_N"]:
+            return True
+        if KING_ATTACKS[sq] & bb[f"{color}_K"]:
+            return True
+        queens = bb[f"{color}_Q"]
+        if bishop_attacks(sq, occ) & (bb[f"{color}_B"] | queens):
+            return True
+        return bool(rook_attacks(sq, occ) & (bb[f"{color}_R"] | queens))
 
     def is_checkmate(self, color: str) -> bool:
-        return self.is_in_check(color) and not self._has_any_legal_move(color)
+        return self.is_in_check(color) and not self.has_legal_move(color)
 
     def is_stalemate(self, color: str) -> bool:
-        return not self.is_in_check(color) and not self._has_any_legal_move(color)
+        return not self.is_in_check(color) and not self.has_legal_move(color)
+
+    def has_legal_move(self, color: str) -> bool:
+        """Whether color has at least one legal move in the current position."""
+        # The king usually holds the last move in mate/stalemate-like
+        # positions and a queen almost always has one otherwise.
+        for symbol in "KQRBNP":
+            pieces = self.bb[f"{color}_{symbol}"]
+            while pieces:
+                lsb = pieces & -pieces
+                if self._cached_legal_moves_bb(lsb.bit_length() - 1):
+                    return True
+                pieces ^= lsb
+        return False
 
     def find_king_square(self, color: str) -> tuple[int, int] | None:
-        for r in range(8):
-            for c in range(8):
-                p = self.board[r][c]
-                if isinstance(p, King) and p.color == color:
-                    return (r, c)
-        return None
+        king = self.bb[f"{color}_K"]
+        if not king:
+            return None
+        return divmod(king.bit_length() - 1, 8)
 
     # -------------------------------------------------------------------------
 
-    def _find_king(self, color: str) -> tuple[int, int]:
-        sq = self.find_king_square(color)
-        if sq is None:
+    def _find_king(self, color: str) -> int:
+        king = self.bb[f"{color}_K"]
+        if not king:
             raise RuntimeError(f"No {color} king on board")
-        return sq
+        return king.bit_length() - 1
+
+    def _place(self, sq: int, piece) -> None:
+        """Put piece (or None) on sq, keeping bitboards and occupancy in step."""
+        bit = 1 << sq
+        old = self.board[sq]
+        if old is not None:
+            self.bb[_bb_key(old)] ^= bit
+            if old.color == WHITE:
+                self.occ_white ^= bit
+            else:
+                self.occ_black ^= bit
+        if piece is not None:
+            self.bb[_bb_key(piece)] |= bit
+            if piece.color == WHITE:
+                self.occ_white |= bit
+            else:
+                self.occ_black |= bit
+        self.occ = self.occ_white | self.occ_black
+        self.board[sq] = piece
+
+    def _position_changed(self) -> None:
+        self._pins.clear()
+        self._legal_cache.clear()
+
+    def _sync_bitboards(self) -> None:
+        self.bb = {f"{color}_{symbol}": 0 for color in (WHITE, BLACK) for symbol in "PNBRQK"}
+        for sq, piece in enumerate(self.board):
+            if piece is not None:
+                self.bb[_bb_key(piece)] |= 1 << sq
+        self._refresh_occupancy()
+        self._position_changed()
+
+    def _refresh_occupancy(self) -> None:
+        bb = self.bb
+        self.occ_white = (
+            bb["white_P"] | bb["white_N"] | bb["white_B"]
+            | bb["white_R"] | bb["white_Q"] | bb["white_K"]
+        )
+        self.occ_black = (
+            bb["black_P"] | bb["black_N"] | bb["black_B"]
+            | bb["black_R"] | bb["black_Q"] | bb["black_K"]
+        )
+        self.occ = self.occ_white | self.occ_black
 
     def _apply_move(self, start: tuple, end: tuple, piece) -> None:
         sr, sc = start
         er, ec = end
-
-        if isinstance(piece, Pawn) and end == self.en_passant_target:
-            self.board[sr][ec] = None
-
-        if isinstance(piece, King):
-            dc = ec - sc
-            if dc == 2:
-                self.board[sr][5] = self.board[sr][7]
-                self.board[sr][7] = None
-            elif dc == -2:
-                self.board[sr][3] = self.board[sr][0]
-                self.board[sr][0] = None
-
-        self.board[er][ec] = piece
-        self.board[sr][sc] = None
-
-    def _update_castling_rights(self, piece, start: tuple) -> None:
-        sr, sc = start
-        if isinstance(piece, King):
-            self.castling_rights[piece.color]["kingside"] = False
-            self.castling_rights[piece.color]["queenside"] = False
-        elif isinstance(piece, Rook):
-            rights = self.castling_rights.get(piece.color, {})
-            if sc == 7:
-                rights["kingside"] = False
-            elif sc == 0:
-                rights["queenside"] = False
+        bb = self.bb
+        board = self.board
+        r8 = sr << 3
+        from_sq = r8 + sc
+        to_sq = er * 8 + ec
+        to_bit = 1 << to_sq
+        own_mask = (1 << from_sq) | to_bit
+        removed = 0
+
+        bb[_bb_key(piece)] ^= own_mask
+
+        captured = board[to_sq]
+        if captured is not None:
+            bb[_bb_key(captured)] ^= to_bit
+            removed = to_bit
+        elif piece.KIND == PAWN and end == self.en_passant_target:
+            ep_sq = r8 + ec
+            ep_bit = 1 << ep_sq
+            bb[_bb_key(board[ep_sq])] ^= ep_bit
+            removed = ep_bit
+            board[ep_sq] = None
+
+        if piece.KIND == KING and abs(ec - sc) == 2:
+            rook_from, rook_to = (r8 + 7, r8 + 5) if ec > sc else (r8, r8 + 3)
+            rook = board[rook_from]
+            if rook is not None:
+                rook_mask = (1 << rook_from) | (1 << rook_to)
+                bb[_bb_key(rook)] ^= rook_mask
+                own_mask |= rook_mask
+                board[rook_to] = rook
+                board[rook_from] = None
+
+        if piece.color == WHITE:
+            self.occ_white ^= own_mask
+            self.occ_black ^= removed
+        else:
+            self.occ_black ^= own_mask
+            self.occ_white ^= removed
+        self.occ = self.occ_white | self.occ_black
+
+        board[to_sq] = piece
+        board[from_sq] = None
+
+    def _update_castling_rights(self, piece, start: tuple, end: tuple) -> None:
+        if piece.KIND == KING:
+            self.castling_mask &= ~(WK | WQ) if piece.color == WHITE else ~(BK | BQ)
+            return
+        # A rook leaving its corner, or anything landing on one, ends that
+        # side's castling for good, even if another rook gets there later.
+        lost = _CORNER_RIGHTS.get(end[0] * 8 + end[1], 0)
+        if piece.KIND == ROOK:
+            lost |= _CORNER_RIGHTS.get(start[0] * 8 + start[1], 0)
+        self.castling_mask &= ~lost
 
     def _update_en_passant(self, piece, start: tuple, end: tuple) -> None:
         sr, _ = start
         er, ec = end
-        if isinstance(piece, Pawn) and abs(er - sr) == 2:
+        if piece.KIND == PAWN and abs(er - sr) == 2:
             self.en_passant_target = ((sr + er) // 2, ec)
         else:
             self.en_passant_target = None
 
-    def _causes_check(self, fr: int, fc: int, end: tuple[int, int]) -> bool:
-        er, ec = end
-        moving = self.board[fr][fc]
-        captured = self.board[er][ec]
-        ep_sq = ep_piece = None
+    def _attackers_bb(self, sq: int, color: str, occ: int) -> int:
+        """Bitboard of color's pieces attacking sq, with sliders blocked by occ."""
+        bb = self.bb
+        queens = bb[f"{color}_Q"]
+        return (
+            (PAWN_ATTACKS[BLACK if color == WHITE else WHITE][sq] & bb[f"{color}_P"])
+            | (KNIGHT_ATTACKS[sq] & bb[f"{color}_N"])
+            | (KING_ATTACKS[sq] & bb[f"{color}_K"])
+            | (bishop_attacks(sq, occ) & (bb[f"{color}_B"] | queens))
+            | (rook_attacks(sq, occ) & (bb[f"{color}_R"] | queens))
+        )
 
-        if isinstance(moving, Pawn) and end == self.en_passant_target:
-            ep_sq = (fr, ec)
-            ep_piece = self.board[fr][ec]
-            self.board[fr][ec] = None
+    def _compute_pins_and_checkers(self, color: str) -> tuple[int, int, int]:
+        """
+        Return (pinned, checkers, check_ray) for color's king.
 
-        self.board[er][ec] = moving
-        self.board[fr][fc] = None
+        pinned holds color's pieces that are the only blocker between the king
+        and an enemy slider; check_ray holds the squares between the king and
+        a single sliding checker, i.e. the squares a block can land on.
+        """
+        king_sq = self._find_king(color)
+        opponent = BLACK if color == WHITE else WHITE
+        bb = self.bb
+        own = self.occ_white if color == WHITE else self.occ_black
+        enemy = self.occ ^ own
+
+        checkers = self._attackers_bb(king_sq, opponent, self.occ)
+        check_ray = 0
+        if checkers and not checkers & (checkers - 1):
+            check_ray = BETWEEN[king_sq][checkers.bit_length() - 1]
+
+        # X-ray from the king through own pieces: sliders seen this way pin
+        # whatever single own piece stands in between.
+        queens = bb[f"{opponent}_Q"]
+        snipers = (
+            (rook_attacks(king_sq, enemy) & (bb[f"{opponent}_R"] | queens))
+            | (bishop_attacks(king_sq, enemy) & (bb[f"{opponent}_B"] | queens))
+        )
+        pinned = 0
+        while snipers:
+            lsb = snipers & -snipers
+            blockers = BETWEEN[king_sq][lsb.bit_length() - 1] & self.occ
+            if blockers and not blockers & (blockers - 1) and blockers & own:
+                pinned |= blockers
+            snipers ^= lsb
+
+        return pinned, checkers, check_ray
+
+    def _pins_and_checkers(self, color: str) -> tuple[int, int, int]:
+        cached = self._pins.get(color)
+        if cached is None:
+            cached = self._pins[color] = self._compute_pins_and_checkers(color)
+        return cached
+
+    def _cached_legal_moves_bb(self, sq: int) -> int:
+        moves = self._legal_cache.get(sq)
+        if moves is None:
+            moves = self._legal_cache[sq] = self._legal_moves_bb(sq)
+        return moves
+
+    def _legal_moves_bb(self, sq: int) -> int:
+        """Bitboard of legal destinations for the piece on sq, whoever's turn it is."""
+        piece = self.board[sq]
+        moves = piece.moves_bb(self, sq)
+
+        if piece.KIND == KING:
+            opponent = BLACK if piece.color == WHITE else WHITE
+            occ = self.occ ^ (1 << sq)
+            legal = 0
+            while moves:
+                lsb = moves & -moves
+                if not self.attackers_to(lsb.bit_length() - 1, opponent, occ):
+                    legal |= lsb
+                moves ^= lsb
+            return legal
+
+        ep_legal = 0
+        if piece.KIND == PAWN and self.en_passant_target is not None:
+            er, ec = self.en_passant_target
+            ep_bit = 1 << (er * 8 + ec)
+            if moves & ep_bit:
+                moves ^= ep_bit
+                if not self._en_passant_causes_check(sq >> 3, sq & 7, self.en_passant_target):
+                    ep_legal = ep_bit
+
+        pinned, checkers, check_ray = self._pins_and_checkers(piece.color)
+        if pinned >> sq & 1:
+            moves &= LINE[self._find_king(piece.color)][sq]
+        if checkers:
+            if checkers & (checkers - 1):
+                return ep_legal
+            moves &= checkers | check_ray
+        return moves | ep_legal
+
+    def _en_passant_causes_check(self, fr: int, fc: int, end: tuple[int, int]) -> bool:
+        # En passant clears two squares on the mover's rank, which the pin
+        # test cannot see, so play it out on the board instead.
+        er, ec = end
+        r8 = fr << 3
+        moving = self.board[r8 + fc]
+        captured = self.board[r8 + ec]
+
+        # _place leaves the caches alone: the position is restored before
+        # anything else reads them.
+        to_sq = er * 8 + ec
+        self._place(r8 + ec, None)
+        self._place(to_sq, moving)
+        self._place(r8 + fc, None)
         in_check = self.is_in_check(moving.color)
-        self.board[fr][fc] = moving
-        self.board[er][ec] = captured
-
-        if ep_sq is not None:
-            self.board[ep_sq[0]][ep_sq[1]] = ep_piece
+        self._place(r8 + fc, moving)
+        self._place(to_sq, None)
+        self._place(r8 + ec, captured)
 
         return in_check
 
-    def _has_any_legal_move(self, color: str) -> bool:
-        saved = self.turn
-        self.turn = color
-        result = any(
-            self.get_legal_moves(r, c)
-            for r in range(8)
-            for c in range(8)
-            if self.board[r][c] is not None and self.board[r][c].color == color
-        )
-        self.turn = saved
-        return result
-
     def _log_entry(self, start: tuple, end: tuple, piece) -> dict:
         er, ec = end
         return {
             "piece": piece,
             "start": start,
             "end": end,
-            "captured": self.board[er][ec],
+            "captured": self.board[er * 8 + ec],
             "en_passant_before": self.en_passant_target,
-            "castling_rights_before": {
-                WHITE: dict(self.castling_rights[WHITE]),
-                BLACK: dict(self.castling_rights[BLACK]),
-            },
+            "castling_mask_before": self.castling_mask,
         }
@@ -4,133 +4,324 @@ from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from .engine import ChessEngine
 
+# Square (row, col) maps to bit row * 8 + col, so bit 0 is a8 and bit 63 is h1.
+FULL = 0xFFFFFFFFFFFFFFFF
+FILE_A = 0x0101010101010101
+FILE_H = FILE_A << 7
+RANK_7 = 0xFF << 8   # black pawn start row
+RANK_2 = 0xFF << 48  # white pawn start row
+
+# Piece kinds, compared as plain ints on hot paths instead of isinstance.
+PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING = range(1, 7)
+
+# Castling rights bits.
+WK, WQ, BK, BQ = 1, 2, 4, 8
+
+
+SQUARES = tuple(divmod(sq, 8) for sq in range(64))
+
+
+def squares(bb: int) -> list[tuple[int, int]]:
+    """Unpack a bitboard into (row, col) tuples, lowest bit first."""
+    out = []
+    while bb:
+        lsb = bb & -bb
+        out.append(SQUARES[lsb.bit_length() - 1])
+        bb ^= lsb
+    return out
+
 
 class Piece:
+    __slots__ = ("color", "sprite_key")
+    NAME = "piece"
+    SYMBOL = "?"
+    KIND = 0
+
     def __init__(self, color: str):
         self.color = color
+        self.sprite_key = f"{color}_{self.NAME}"
 
     def get_moves(self, engine: ChessEngine, row: int, col: int) -> list[tuple[int, int]]:
+        return squares(self.moves_bb(engine, row * 8 + col))
+
+    def moves_bb(self, engine: ChessEngine, sq: int) -> int:
         raise NotImplementedError
 
-    def is_enemy(self, engine: ChessEngine, row: int, col: int) -> bool:
-        piece = engine.board[row][col]
-        return piece is not None and piece.color != self.color
-
-    def is_friendly(self, engine: ChessEngine, row: int, col: int) -> bool:
-        piece = engine.board[row][col]
-        return piece is not None and piece.color == self.color
-
-    def is_empty(self, engine: ChessEngine, row: int, col: int) -> bool:
-        return engine.board[row][col] is None
-
-    @staticmethod
-    def in_bounds(row: int, col: int) -> bool:
-        return 0 <= row <= 7 and 0 <= col <= 7
-
-    def slide(
-        self,
-        engine: ChessEngine,
-        row: int,
-        col: int,
-        directions: list[tuple[int, int]],
-    ) -> list[tuple[int, int]]:
-        moves = []
-        for dr, dc in directions:
-            r, c = row + dr, col + dc
-            while self.in_bounds(r, c):
-                if self.is_empty(engine, r, c):
-                    moves.append((r, c))
-                elif self.is_enemy(engine, r, c):
-                    moves.append((r, c))
-                    break
-                else:
-                    break
-                r += dr
-                c += dc
-        return moves
+    def own_occupancy(self, engine: ChessEngine) -> int:
+        return engine.occ_white if self.color == "white" else engine.occ_black
 
+    def enemy_occupancy(self, engine: ChessEngine) -> int:
+        return engine.occ_black if self.color == "white" else engine.occ_white
 
-class Pawn(Piece):
-    def get_moves(self, engine: ChessEngine, row: int, col: int) -> list[tuple[int, int]]:
-        moves = []
-        direction = -1 if self.color == "white" else 1
-        start_row = 6 if self.color == "white" else 1
-
-        one_ahead = (row + direction, col)
-        if self.in_bounds(*one_ahead) and self.is_empty(engine, *one_ahead):
-            moves.append(one_ahead)
-            two_ahead = (row + 2 * direction, col)
-            if row == start_row and self.is_empty(engine, *two_ahead):
-                moves.append(two_ahead)
-
-        for dc in (-1, 1):
-            target = (row + direction, col + dc)
-            if not self.in_bounds(*target):
-                continue
-            if self.is_enemy(engine, *target) or target == engine.en_passant_target:
-                moves.append(target)
 
-        return moves
+class Pawn(Piece):
+    __slots__ = ()
+    NAME = "pawn"
+    SYMBOL = "P"
+    KIND = PAWN
+
+    def moves_bb(self, engine: ChessEngine, sq: int) -> int:
+        bit = 1 << sq
+        empty = ~engine.occ
+        targets = self.enemy_occupancy(engine)
+        if engine.en_passant_target is not None:
+            er, ec = engine.en_passant_target
+            targets |= 1 << (er * 8 + ec)
+
+        if self.color == "white":
+            pushes = (bit >> 8) & empty
+            pushes |= ((bit & RANK_2) >> 16) & empty & ~(engine.occ >> 8)
+            captures = ((bit & ~FILE_A) >> 9) | ((bit & ~FILE_H) >> 7)
+        else:
+            pushes = (bit << 8) & empty
+            pushes |= ((bit & RANK_7) << 16) & empty & ~(engine.occ << 8)
+            captures = ((bit & ~FILE_A) << 7) | ((bit & ~FILE_H) << 9)
+
+        return (pushes | (captures & targets)) & FULL
 
 
 class Rook(Piece):
+    __slots__ = ()
+    NAME = "rook"
+    SYMBOL = "R"
+    KIND = ROOK
     DIRECTIONS = [(0, 1), (0, -1), (1, 0), (-1, 0)]
 
-    def get_moves(self, engine: ChessEngine, row: int, col: int) -> list[tuple[int, int]]:
-        return self.slide(engine, row, col, self.DIRECTIONS)
+    def moves_bb(self, engine: ChessEngine, sq: int) -> int:
+        return rook_attacks(sq, engine.occ) & ~self.own_occupancy(engine)
 
 
 class Knight(Piece):
+    __slots__ = ()
+    NAME = "knight"
+    SYMBOL = "N"
+    KIND = KNIGHT
     JUMPS = [(-2, -1), (-2, 1), (-1, -2), (-1, 2), (1, -2), (1, 2), (2, -1), (2, 1)]
 
-    def get_moves(self, engine: ChessEngine, row: int, col: int) -> list[tuple[int, int]]:
-        return [
-            (row + dr, col + dc)
-            for dr, dc in self.JUMPS
-            if self.in_bounds(row + dr, col + dc)
-            and not self.is_friendly(engine, row + dr, col + dc)
-        ]
+    def moves_bb(self, engine: ChessEngine, sq: int) -> int:
+        return KNIGHT_ATTACKS[sq] & ~self.own_occupancy(engine)
 
 
 class Bishop(Piece):
+    __slots__ = ()
+    NAME = "bishop"
+    SYMBOL = "B"
+    KIND = BISHOP
     DIRECTIONS = [(-1, -1), (-1, 1), (1, -1), (1, 1)]
 
-    def get_moves(self, engine: ChessEngine, row: int, col: int) -> list[tuple[int, int]]:
-        return self.slide(engine, row, col, self.DIRECTIONS)
+    def moves_bb(self, engine: ChessEngine, sq: int) -> int:
+        return bishop_attacks(sq, engine.occ) & ~self.own_occupancy(engine)
 
 
 class Queen(Piece):
-    DIRECTIONS = [(0, 1), (0, -1), (1, 0), (-1, 0), (-1, -1), (-1, 1), (1, -1), (1, 1)]
+    __slots__ = ()
+    NAME = "queen"
+    SYMBOL = "Q"
+    KIND = QUEEN
 
-    def get_moves(self, engine: ChessEngine, row: int, col: int) -> list[tuple[int, int]]:
-        return self.slide(engine, row, col, self.DIRECTIONS)
+    def moves_bb(self, engine: ChessEngine, sq: int) -> int:
+        attacks = rook_attacks(sq, engine.occ) | bishop_attacks(sq, engine.occ)
+        return attacks & ~self.own_occupancy(engine)
 
 
 class King(Piece):
+    __slots__ = ()
+    NAME = "king"
+    SYMBOL = "K"
+    KIND = KING
     STEPS = [(-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1)]
-
-    def get_moves(self, engine: ChessEngine, row: int, col: int) -> list[tuple[int, int]]:
-        moves = [
-            (row + dr, col + dc)
-            for dr, dc in self.STEPS
-            if self.in_bounds(row + dr, col + dc)
-            and not self.is_friendly(engine, row + dr, col + dc)
-        ]
-
-        rights = engine.castling_rights.get(self.color, {})
-        if rights.get("kingside") and self._kingside_clear(engine, row):
-            moves.append((row, col + 2))
-        if rights.get("queenside") and self._queenside_clear(engine, row):
-            moves.append((row, col - 2))
+    HOME = {"white": 60, "black": 4}
+    CASTLE_RIGHTS = {"white": (WK, WQ), "black": (BK, BQ)}
+    # Squares that must be empty to castle: (kingside, queenside).
+    CASTLE_PATHS = {
+        "white": (0b0110 << 60, 0b1110 << 56),
+        "black": (0b0110 << 4, 0b1110),
+    }
+    # Corner squares the castling rook must still stand on: (kingside, queenside).
+    CASTLE_ROOKS = {
+        "white": (1 << 63, 1 << 56),
+        "black": (1 << 7, 1 << 0),
+    }
+
+    def moves_bb(self, engine: ChessEngine, sq: int) -> int:
+        moves = KING_ATTACKS[sq] & ~self.own_occupancy(engine)
+        if sq != self.HOME[self.color]:
+            return moves  # castling rights only matter on the home square
+
+        right_k, right_q = self.CASTLE_RIGHTS[self.color]
+        kingside, queenside = self.CASTLE_PATHS[self.color]
+        rook_k, rook_q = self.CASTLE_ROOKS[self.color]
+        rooks = engine.bb[f"{self.color}_R"]
+        if engine.castling_mask & right_k and rooks & rook_k and not engine.occ & kingside:
+            moves |= 1 << (sq + 2)
+        if engine.castling_mask & right_q and rooks & rook_q and not engine.occ & queenside:
+            moves |= 1 << (sq - 2)
 
         return moves
 
-    def _kingside_clear(self, engine: ChessEngine, row: int) -> bool:
-        return self.is_empty(engine, row, 5) and self.is_empty(engine, row, 6)
 
-    def _queenside_clear(self, engine: ChessEngine, row: int) -> bool:
-        return (
-            self.is_empty(engine, row, 1)
-            and self.is_empty(engine, row, 2)
-            and self.is_empty(engine, row, 3)
-        )
+def rook_attacks(sq: int, occ: int) -> int:
+    idx = (((occ & ROOK_MASKS[sq]) * ROOK_MAGICS[sq]) & FULL) >> ROOK_SHIFTS[sq]
+    return ROOK_ATTACKS[sq][idx]
+
+
+def bishop_attacks(sq: int, occ: int) -> int:
+    idx = (((occ & BISHOP_MASKS[sq]) * BISHOP_MAGICS[sq]) & FULL) >> BISHOP_SHIFTS[sq]
+    return BISHOP_ATTACKS[sq][idx]
+
+
+def _step_table(offsets: list[tuple[int, int]]) -> tuple[int, ...]:
+    table = []
+    for sq in range(64):
+        row, col = divmod(sq, 8)
+        bb = 0
+        for dr, dc in offsets:
+            r, c = row + dr, col + dc
+            if 0 <= r <= 7 and 0 <= c <= 7:
+                bb |= 1 << (r * 8 + c)
+        table.append(bb)
+    return tuple(table)
+
+
+KNIGHT_ATTACKS = _step_table(Knight.JUMPS)
+KING_ATTACKS = _step_table(King.STEPS)
+
+
+def _rays(dr: int, dc: int) -> tuple[tuple[int, ...], ...]:
+    """Per square, the bits walked in direction (dr, dc) up to the board edge."""
+    rays = []
+    for sq in range(64):
+        row, col = divmod(sq, 8)
+        ray = []
+        r, c = row + dr, col + dc
+        while 0 <= r <= 7 and 0 <= c <= 7:
+            ray.append(1 << (r * 8 + c))
+            r += dr
+            c += dc
+        rays.append(tuple(ray))
+    return tuple(rays)
+
+
+RAYS = {
+    (dr, dc): _rays(dr, dc)
+    for dr in (-1, 0, 1)
+    for dc in (-1, 0, 1)
+    if dr or dc
+}
+
+
+def _ray_attacks(occ: int, rays: list[tuple[int, ...]]) -> int:
+    bb = 0
+    for ray in rays:
+        for bit in ray:
+            bb |= bit
+            if occ & bit:
+                break
+    return bb
+
+
+def _relevant_mask(rays: list[tuple[int, ...]]) -> int:
+    """Squares whose occupancy can stop one of the rays; the board edge never can."""
+    bb = 0
+    for ray in rays:
+        for bit in ray[:-1]:
+            bb |= bit
+    return bb
+
+
+def _magic_tables(
+    directions: list[tuple[int, int]],
+    magics: tuple[int, ...],
+) -> tuple[tuple[int, ...], tuple[int, ...], tuple[list[int], ...]]:
+    masks, shifts, attacks = [], [], []
+    for sq in range(64):
+        rays = [RAYS[direction][sq] for direction in directions]
+        mask = _relevant_mask(rays)
+        shift = 64 - mask.bit_count()
+        table = [0] * (1 << (64 - shift))
+        subset = 0
+        while True:
+            table[((subset * magics[sq]) & FULL) >> shift] = _ray_attacks(subset, rays)
+            subset = (subset - mask) & mask
+            if not subset:
+                break
+        masks.append(mask)
+        shifts.append(shift)
+        attacks.append(table)
+    return tuple(masks), tuple(shifts), tuple(attacks)
+
+
+# Fixed magic multipliers: every relevant-occupancy subset of a square maps to
+# a slot holding the right attack set, so no search happens at import.
+ROOK_MAGICS = (
+    0x1080004008801020, 0x0840092002C03000, 0x1900200010400900, 0x0880100008000480,
+    0x4200100420080200, 0x8100020100080400, 0x0200040110886200, 0x0200008040220411,
+    0x0404800084400220, 0x0000401000402000, 0x0086001081220440, 0x0408800800100280,
+    0x000A001201040820, 0x8848800200840080, 0x4001000100040200, 0x0442000102105084,
+    0x9080010020804100, 0x0040404000201009, 0x0000808010002009, 0x2200090021D00100,
+    0x0008008008040080, 0x0004004002010040, 0x0011040008015042, 0x00000A0001768104,
+    0x0000800080204009, 0x2010004140002001, 0x9800200280100080, 0x1000100080080080,
+    0x0442000A00049020, 0x2100040080020080, 0x0800120400900148, 0x0010040A00128541,
+    0x2800804000800030, 0x1010002000400041, 0x4000200011004100, 0x0610008410800800,
+    0x0400802402800800, 0xC100020080800400, 0x0002000802000401, 0x0182085882000401,
+    0x0220204000808000, 0x2860100040024022, 0x0001002004110040, 0x99101042000A0020,
+    0x0004080004008080, 0x0010040002008080, 0x2012004881020004, 0x8300842444820011,
+    0x0088403882010200, 0x0820400080210100, 0x0110910040A00300, 0x0801100280080480,
+    0x0242009008200600, 0x1002000489500200, 0x0040800200010080, 0x0091800041000080,
+    0x0000209300488001, 0x04C1002414824001, 0x020020000B001041, 0x7000100004200901,
+    0x8002002004100802, 0x30010002084C0007, 0x0888221800813004, 0x4000002840840112,
+)
+
+BISHOP_MAGICS = (
+    0xA010041108003100, 0x006082020A002900, 0x6810010619200000, 0x08281A0520000408,
+    0x0001104001000400, 0x0018901008048400, 0x00040A0210245280, 0x000200210808A402,
+    0x9140048410821200, 0x0800091010820041, 0x20504804832202C0, 0x0100091401081000,
+    0x8021011140000012, 0x0810020804450400, 0x208B0542109008A2, 0x0080084A08040204,
+    0x0040E2A80811244C, 0x2505022008008108, 0x0430220100420040, 0x010A040420220040,
+    0x1105000290400000, 0x0093001200822120, 0x4000A62048043004, 0x280120048A015004,
+    0x006090002A020814, 0x44042000240800D0, 0x01102800040A4400, 0x1004080080220040,
+    0x0001001011004024, 0x0010044000805040, 0x0914041200820100, 0x0004821012821480,
+    0x0024040500C05021, 0x0088611002080200, 0x0116080A00040020, 0x4000020080080080,
+    0x2450450140840040, 0x0000880201484100, 0x0222020404020092, 0x8081110600002E00,
+    0x2842101105000801, 0x1100809008001025, 0x00020202221C0400, 0x0422014022009020,
+    0x0210046102100C00, 0xC004008082029102, 0x00AA461801101200, 0x0404080080201108,
+    0x020542108C205002, 0x0410544804100100, 0x0040910841100000, 0x0400200042021100,
+    0x00004204850400C0, 0x0200100410A42102, 0x1040020801210102, 0x0805040410420000,
+    0x2884804130100200, 0x800C262201242000, 0x1058000194108800, 0x0014221054420204,
+    0x0104000012A02200, 0x0200881003300100, 0x0140400202840100, 0x0402020801010201,
+)
+
+ROOK_MASKS, ROOK_SHIFTS, ROOK_ATTACKS = _magic_tables(Rook.DIRECTIONS, ROOK_MAGICS)
+BISHOP_MASKS, BISHOP_SHIFTS, BISHOP_ATTACKS = _magic_tables(Bishop.DIRECTIONS, BISHOP_MAGICS)
+
+
+def _line_tables() -> tuple[tuple[tuple[int, ...], ...], tuple[tuple[int, ...], ...]]:
+    """BETWEEN[a][b] holds the squares strictly between two aligned squares and
+    LINE[a][b] the whole rank, file or diagonal through them; both are 0 otherwise."""
+    between, line = [], []
+    for a in range(64):
+        between_row, line_row = [], []
+        for b in range(64):
+            bit_b = 1 << b
+            if a != b and rook_attacks(a, 0) & bit_b:
+                attacks = rook_attacks
+            elif a != b and bishop_attacks(a, 0) & bit_b:
+                attacks = bishop_attacks
+            else:
+                between_row.append(0)
+                line_row.append(0)
+                continue
+            between_row.append(attacks(a, bit_b) & attacks(b, 1 << a))
+            line_row.append((attacks(a, 0) & attacks(b, 0)) | (1 << a) | bit_b)
+        between.append(tuple(between_row))
+        line.append(tuple(line_row))
+    return tuple(between), tuple(line)
+
+
+BETWEEN, LINE = _line_tables()
+
+# Squares a pawn of the given colour on sq attacks.
+PAWN_ATTACKS = {
+    "white": _step_table([(-1, -1), (-1, 1)]),
+    "black": _step_table([(1, -1), (1, 1)]),
+}
@@ -1,5 +1,3 @@
-from chess.pieces import Pawn, Rook, Knight, Bishop, Queen, King
-
 # Sprite / tile geometry
 BASE_SPRITE_SIZE = 16
 SPRITE_HEIGHT    = 32
@@ -64,11 +62,6 @@ ASSET_PIECE_DIR = "assets/pieces"
 ASSET_AUDIO_DIR = "assets/audio"
 ASSET_FONT_PATH = "assets/font/font.png"
 
-PIECE_NAMES = {
-    Pawn: "pawn", Rook: "rook", Knight: "knight",
-    Bishop: "bishop", Queen: "queen", King: "king",
-}
-
 PROMOTION_CHOICES = ["queen", "rook", "bishop", "knight"]
 
 # Bitmap font sheet
@@ -3,11 +3,15 @@ from constants import FONT_CHAR_WIDTH, FONT_CHAR_HEIGHT, FONT_SCALE, FONT_COLS
 
 
 class PixelFont:
+    # The sheet must not be mutated after construction: tinted copies of it
+    # are cached per colour and would go stale.
     def __init__(self, sheet: pygame.Surface | None):
         self.sheet = sheet
         self.char_w = FONT_CHAR_WIDTH * FONT_SCALE
         self.char_h = FONT_CHAR_HEIGHT * FONT_SCALE
         self._first_char = 0x20
+        self._tint_cache: dict[tuple[int, int, int], pygame.Surface] = {}
+        self._glyph_cache: dict[tuple[int, int, int], list[pygame.Surface]] = {}
 
     def render(
         self,
@@ -19,27 +23,45 @@ class PixelFont:
     ) -> None:
         if self.sheet is None:
             return
-        sheet = self._tinted(color)
+        glyphs = self._glyphs(color)
+        count = len(glyphs)
+        batch = []
         cx = x
         for char in text:
             code = ord(char) - self._first_char
             if code < 0:
                 continue
-            src = pygame.Rect(
-                (code % FONT_COLS) * self.char_w,
-                (code // FONT_COLS) * self.char_h,
-                self.char_w,
-                self.char_h,
-            )
-            surface.blit(sheet, (cx, y), src)
+            if code < count:
+                batch.append((glyphs[code], (cx, y)))
             cx += self.char_w
+        surface.blits(batch, doreturn=False)
 
     def text_width(self, text: str) -> int:
         return len(text) * self.char_w
 
+    def _glyphs(self, color: tuple) -> list[pygame.Surface]:
+        glyphs = self._glyph_cache.get(color)
+        if glyphs is None:
+            sheet = self._tinted(color)
+            count = FONT_COLS * (sheet.get_height() // self.char_h)
+            glyphs = [
+                sheet.subsurface(pygame.Rect(
+                    (i % FONT_COLS) * self.char_w,
+                    (i // FONT_COLS) * self.char_h,
+                    self.char_w,
+                    self.char_h,
+                ))
+                for i in range(count)
+            ]
+            self._glyph_cache[color] = glyphs
+        return glyphs
+
     def _tinted(self, color: tuple) -> pygame.Surface:
         if color == (255, 255, 255):
             return self.sheet
-        tinted = self.sheet.copy()
-        tinted.fill(color, special_flags=pygame.BLEND_RGB_MULT)
+        tinted = self._tint_cache.get(color)
+        if tinted is None:
+            tinted = self.sheet.copy()
+            tinted.fill(color, special_flags=pygame.BLEND_RGB_MULT)
+            self._tint_cache[color] = tinted
         return tinted
@@ -4,13 +4,30 @@ import time
 import pygame
 
 from chess.engine import ChessEngine
-from chess.pieces import King, Pawn
+from chess.pieces import KING, PAWN
 from assets import AssetManager
 from font import PixelFont
 from particles import ParticleSystem
 from constants import *
 
 
+# Tremor offsets sampled once per frame over a full cycle. The vertical wobble
+# runs at 0.7x the horizontal rate, so the pair only repeats every 10 periods.
+_TREMOR_CYCLE = 10 / TREMOR_FREQUENCY
+_TREMOR_STEPS = max(1, round(TARGET_FPS * _TREMOR_CYCLE))
+_TREMOR_LUT = [
+    (
+        int(math.sin(t * TREMOR_FREQUENCY * 2 * math.pi) * TREMOR_AMPLITUDE),
+        int(math.cos(t * TREMOR_FREQUENCY * 2 * math.pi * 0.7) * TREMOR_AMPLITUDE),
+    )
+    for t in (i * _TREMOR_CYCLE / _TREMOR_STEPS for i in range(_TREMOR_STEPS))
+]
+
+
+def _by_col(entry: tuple) -> int:
+    return entry[1]
+
+
 def _ease_out(t: float) -> float:
     return 1.0 - (1.0 - t) ** 2
 
@@ -36,8 +53,36 @@ class ChessGUI:
         self.screen = pygame.display.get_surface()
         self.particles = ParticleSystem()
 
+        # Screen position of every tile and of the piece standing on it, by [row][col].
+        self._tile_px = [
+            [(BOARD_ORIGIN_X + (7 - r) * TILE_W, BOARD_ORIGIN_Y + c * TILE_H) for c in range(8)]
+            for r in range(8)
+        ]
+        self._piece_px = [[(x, y + PIECE_Y_OFFSET) for x, y in row] for row in self._tile_px]
+
+        # Translucent tile fills, built on first use per (color, alpha).
+        self._overlay_cache: dict[tuple[tuple, int], pygame.Surface] = {}
+        # Legal-target marker (fill plus outline) keyed by whether the move captures.
+        self._legal_markers = {
+            False: self._build_legal_marker(COLOR_LEGAL_MOVE, ALPHA_LEGAL_MOVE),
+            True: self._build_legal_marker(COLOR_LEGAL_CAPTURE, ALPHA_LEGAL_CAPTURE),
+        }
+
+        self._dim_surface = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT), pygame.SRCALPHA)
+        self._dim_surface.fill((0, 0, 0, 160))
+        self._dim_surface = self._dim_surface.convert_alpha()
+        self._game_over_surface = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT), pygame.SRCALPHA)
+        self._game_over_surface.fill((*COLOR_OVERLAY_BG, ALPHA_OVERLAY))
+        self._game_over_surface = self._game_over_surface.convert_alpha()
+
+        self._static_bg = self._build_static_bg()
+
+        # Full flip after any state change; otherwise only moving things are presented.
+        self._force_full_redraw = True
+        self._dirty_rects: list[pygame.Rect] = []
+
         self.selected_square: tuple[int, int] | None = None
-        self.legal_moves: list[tuple[int, int]] = []
+        self.legal_moves: frozenset[tuple[int, int]] = frozenset()
         self.dragging = False
         self.drag_piece_pos: tuple[int, int] = (0, 0)
         self.drag_origin: tuple[int, int] | None = None
@@ -58,14 +103,18 @@ class ChessGUI:
         self.game_over = False
         self.game_over_msg: str = ""
 
-        self._last_frame_time: float = time.monotonic()
+        # Check state per colour; rebuilt by render() after the position changes.
+        self._check_cache: dict[str, bool] | None = None
+
+        # Timestamp of the frame being drawn; draw helpers read it instead of the clock.
+        self._frame_time: float = time.monotonic()
 
     # -------------------------------------------------------------------------
     # Coordinate helpers
     # -------------------------------------------------------------------------
 
     def tile_to_pixel(self, row: int, col: int) -> tuple[int, int]:
-        return (BOARD_ORIGIN_X + (7 - row) * TILE_W, BOARD_ORIGIN_Y + col * TILE_H)
+        return self._tile_px[row][col]
 
     def pixel_to_tile(self, px: int, py: int) -> tuple[int, int] | None:
         bx, by = px - BOARD_ORIGIN_X, py - BOARD_ORIGIN_Y
@@ -74,14 +123,16 @@ class ChessGUI:
         return (7 - bx // TILE_W, by // TILE_H)
 
     def piece_pixel_pos(self, row: int, col: int) -> tuple[int, int]:
-        tx, ty = self.tile_to_pixel(row, col)
-        return (tx, ty + PIECE_Y_OFFSET)
+        return self._piece_px[row][col]
 
     # -------------------------------------------------------------------------
     # Public interface
     # -------------------------------------------------------------------------
 
     def handle_event(self, event: pygame.event.Event) -> None:
+        if event.type != pygame.MOUSEMOTION:
+            self._force_full_redraw = True
+
         if self.game_over:
             if event.type == pygame.MOUSEBUTTONDOWN:
                 self._restart()
@@ -104,20 +155,60 @@ class ChessGUI:
 
     def render(self) -> None:
         now = time.monotonic()
-        dt = now - self._last_frame_time
-        self._last_frame_time = now
-
-        self.particles.update(dt)
-
-        self.screen.fill(COLOR_BORDER)
+        dt = now - self._frame_time
+        self._frame_time = now
+
+        if len(self.particles):
+            self.particles.update(dt)
+
+        if self._check_cache is None:
+            self._check_cache = {
+                "white": self.engine.is_in_check("white"),
+                "black": self.engine.is_in_check("black"),
+            }
+
+        moving = self._moving_rects()
+        if self._force_full_redraw:
+            self._draw_scene()
+            pygame.display.flip()
+            self._force_full_redraw = False
+        else:
+            # Last frame's rects must be repainted too, to erase what moved away.
+            self._dirty_rects = self._dirty_rects + moving
+            if self._dirty_rects:
+                self.screen.set_clip(self._dirty_rects[0].unionall(self._dirty_rects[1:]))
+                self._draw_scene()
+                self.screen.set_clip(None)
+                pygame.display.update(self._dirty_rects)
+        self._dirty_rects = moving
+
+    def _draw_scene(self) -> None:
+        self.screen.blit(self._static_bg, (0, 0))
         self._draw_board()
-        self._draw_border_rank_numbers_top()
         self._draw_pieces()
         self._draw_border()
-        self._draw_border_labels()
         self._draw_promotion_menu()
         self._draw_game_over()
-        pygame.display.flip()
+
+    def _moving_rects(self) -> list[pygame.Rect]:
+        """Screen areas that can change between frames without any state change."""
+        rects = []
+        if self.animating:
+            start = pygame.Rect(self.anim_start_px, (PIECE_WIDTH, PIECE_HEIGHT))
+            rects.append(start.union(pygame.Rect(self.anim_end_px, (PIECE_WIDTH, PIECE_HEIGHT))))
+        if self.dragging:
+            x, y = self.drag_piece_pos
+            rects.append(pygame.Rect(
+                x - PIECE_WIDTH // 2, y - PIECE_HEIGHT // 2, PIECE_WIDTH, PIECE_HEIGHT,
+            ))
+        king = self._checked_king_square()
+        if king is not None:
+            sprite = pygame.Rect(self.piece_pixel_pos(*king), (PIECE_WIDTH, PIECE_HEIGHT))
+            rects.append(sprite.inflate(2 * TREMOR_AMPLITUDE, 2 * TREMOR_AMPLITUDE))
+        bounds = self.particles.bounds()
+        if bounds is not None:
+            rects.append(bounds)
+        return rects
 
     # -------------------------------------------------------------------------
     # Input
@@ -133,7 +224,7 @@ class ChessGUI:
 
         if piece is not None and piece.color == self.engine.turn:
             self.selected_square = tile
-            self.legal_moves = self.engine.get_legal_moves(row, col)
+            self.legal_moves = frozenset(self.engine.get_legal_moves(row, col))
             self.dragging = True
             self.drag_origin = tile
             self.drag_piece_pos = pos
@@ -144,7 +235,7 @@ class ChessGUI:
             return
 
         self.selected_square = None
-        self.legal_moves = []
+        self.legal_moves = frozenset()
 
     def _on_mouse_up(self, pos: tuple[int, int]) -> None:
         if not self.dragging:
@@ -159,9 +250,10 @@ class ChessGUI:
             self.drag_origin = None
 
     def _handle_promotion_click(self, pos: tuple[int, int]) -> None:
-        for i, rect in enumerate(self.promotion_rects):
+        for rect, choice in zip(self.promotion_rects, PROMOTION_CHOICES):
             if rect.collidepoint(pos):
-                self.engine.promote_pawn(*self.promotion_square, PROMOTION_CHOICES[i])
+                self.engine.promote_pawn(*self.promotion_square, choice)
+                self._check_cache = None
                 self.promotion_active = False
                 self.promotion_square = None
                 self.assets.play("promote")
@@ -179,14 +271,14 @@ class ChessGUI:
         if moving is None:
             return
 
-        sound = self._choose_sound(start, end, moving)
-        captured = self._captured_piece(start, end, moving)
+        sound, captured = self._classify_move(start, end, moving)
 
         self._start_animation(start, end, moving)
         if captured is not None:
             self.particles.spawn_capture(self.tile_to_pixel(*end), captured.color)
 
         result = self.engine.move_piece(start, end)
+        self._check_cache = None
         self.assets.play(sound)
 
         if result["promotion_required"]:
@@ -195,47 +287,42 @@ class ChessGUI:
 
         self._check_game_end()
         self.selected_square = None
-        self.legal_moves = []
+        self.legal_moves = frozenset()
         self.drag_origin = None
 
-    def _choose_sound(self, start: tuple, end: tuple, piece) -> str:
-        er, ec = end
-        target = self.engine.get_piece(er, ec)
-        if isinstance(piece, King) and abs(ec - start[1]) == 2:
-            return "castle"
-        if (target is not None and target.color != piece.color) or (
-            isinstance(piece, Pawn) and end == self.engine.en_passant_target
-        ):
-            return "capture"
-        return "move"
-
-    def _captured_piece(self, start: tuple, end: tuple, moving):
+    def _classify_move(self, start: tuple, end: tuple, moving) -> tuple[str, object]:
+        """Sound to play for the move and the piece it captures, if any."""
         er, ec = end
+        if moving.KIND == KING and abs(ec - start[1]) == 2:
+            return "castle", None
         target = self.engine.get_piece(er, ec)
         if target is not None and target.color != moving.color:
-            return target
-        if isinstance(moving, Pawn) and end == self.engine.en_passant_target:
-            return self.engine.get_piece(start[0], ec)
-        return None
+            return "capture", target
+        if moving.KIND == PAWN and end == self.engine.en_passant_target:
+            return "capture", self.engine.get_piece(start[0], ec)
+        return "move", None
 
     def _check_game_end(self) -> None:
         current = self.engine.turn
-        if self.engine.is_checkmate(current):
-            winner = "BLACK" if current == "white" else "WHITE"
-            self.game_over = True
-            self.game_over_msg = f"{winner} WINS BY CHECKMATE"
-            self.assets.play("game-end")
-        elif self.engine.is_stalemate(current):
+        # The side that just moved can't be in check, so one test fills the cache.
+        in_check = self.engine.is_in_check(current)
+        self._check_cache = {"white": False, "black": False, current: in_check}
+        if not self.engine.has_legal_move(current):
             self.game_over = True
-            self.game_over_msg = "DRAW BY STALEMATE"
+            if in_check:
+                winner = "BLACK" if current == "white" else "WHITE"
+                self.game_over_msg = f"{winner} WINS BY CHECKMATE"
+            else:
+                self.game_over_msg = "DRAW BY STALEMATE"
             self.assets.play("game-end")
-        elif self.engine.is_in_check(current):
+        elif in_check:
             self.assets.play("check")
 
     def _restart(self) -> None:
         self.engine.reset()
+        self._check_cache = None
         self.selected_square = None
-        self.legal_moves = []
+        self.legal_moves = frozenset()
         self.dragging = False
         self.drag_origin = None
         self.animating = False
@@ -253,7 +340,7 @@ class ChessGUI:
         self.promotion_square = square
         self.promotion_color = color
         self.selected_square = None
-        self.legal_moves = []
+        self.legal_moves = frozenset()
         self.drag_origin = None
 
     # -------------------------------------------------------------------------
@@ -270,7 +357,7 @@ class ChessGUI:
         self.anim_start_time = time.monotonic()
 
     def _draw_animated_piece(self) -> None:
-        elapsed = time.monotonic() - self.anim_start_time
+        elapsed = self._frame_time - self.anim_start_time
         t = _ease_out(min(elapsed / ANIMATION_DURATION, 1.0))
         sx, sy = self.anim_start_px
         ex, ey = self.anim_end_px
@@ -288,16 +375,19 @@ class ChessGUI:
     # -------------------------------------------------------------------------
 
     def _draw_board(self) -> None:
+        # The checkerboard itself is part of _static_bg; only overlaid tiles are drawn here.
         checked_king = self._checked_king_square()
-        for row in range(8):
-            for col in range(8):
-                self._draw_tile(row, col, checked_king)
+        tiles = set(self.legal_moves)
+        if self.selected_square is not None:
+            tiles.add(self.selected_square)
+        if checked_king is not None:
+            tiles.add(checked_king)
+        for row, col in tiles:
+            self._draw_tile(row, col, checked_king)
 
     def _draw_tile(self, row: int, col: int, checked_king: tuple | None) -> None:
         tx, ty = self.tile_to_pixel(row, col)
         sq = (row, col)
-        base = COLOR_LIGHT_SQUARE if (row + col) % 2 == 0 else COLOR_DARK_SQUARE
-        pygame.draw.rect(self.screen, base, (tx, ty, TILE_W, TILE_H))
 
         if sq == self.selected_square:
             self._overlay_tile(tx, ty, COLOR_HIGHLIGHT, ALPHA_HIGHLIGHT)
@@ -309,21 +399,28 @@ class ChessGUI:
         if sq in self.legal_moves:
             target = self.engine.get_piece(row, col)
             is_capture = target is not None and target.color != self.engine.turn
-            color = COLOR_LEGAL_CAPTURE if is_capture else COLOR_LEGAL_MOVE
-            alpha = ALPHA_LEGAL_CAPTURE if is_capture else ALPHA_LEGAL_MOVE
-            self._overlay_tile(tx, ty, color, alpha // 2)
-            border = pygame.Surface((TILE_W, TILE_H), pygame.SRCALPHA)
-            pygame.draw.rect(border, (*color, alpha), (0, 0, TILE_W, TILE_H), UNIT)
-            self.screen.blit(border, (tx, ty))
+            self.screen.blit(self._legal_markers[is_capture], (tx, ty))
 
-    def _overlay_tile(self, tx: int, ty: int, color: tuple, alpha: int) -> None:
+    @staticmethod
+    def _build_legal_marker(color: tuple, alpha: int) -> pygame.Surface:
         surf = pygame.Surface((TILE_W, TILE_H), pygame.SRCALPHA)
-        surf.fill((*color, alpha))
+        surf.fill((*color, alpha // 2))
+        # Same colour as the fill, so the outline over it composites to one alpha.
+        edge = alpha + (alpha // 2) * (255 - alpha) // 255
+        pygame.draw.rect(surf, (*color, edge), (0, 0, TILE_W, TILE_H), UNIT)
+        return surf.convert_alpha()
+
+    def _overlay_tile(self, tx: int, ty: int, color: tuple, alpha: int) -> None:
+        surf = self._overlay_cache.get((color, alpha))
+        if surf is None:
+            surf = pygame.Surface((TILE_W, TILE_H), pygame.SRCALPHA)
+            surf.fill((*color, alpha))
+            surf = self._overlay_cache[(color, alpha)] = surf.convert_alpha()
         self.screen.blit(surf, (tx, ty))
 
     def _checked_king_square(self) -> tuple[int, int] | None:
         for color in ("white", "black"):
-            if self.engine.is_in_check(color):
+            if self._check_cache[color]:
                 return self.engine.find_king_square(color)
         return None
 
@@ -339,79 +436,87 @@ class ChessGUI:
         if self.dragging:
             skip.add(self.drag_origin)
 
-        for col in range(8):
-            for row in range(8):
-                if (row, col) in skip:
-                    continue
-                piece = self.engine.get_piece(row, col)
-                if piece is None:
-                    continue
-                px, py = self.piece_pixel_pos(row, col)
-                dx, dy = self._tremor_offset(row, col)
-                self.screen.blit(self.assets.get_piece_sprite(piece), (px + dx, py + dy))
+        any_check = self._check_cache["white"] or self._check_cache["black"]
+        # Sprites are taller than tiles, so draw file by file (top to bottom on
+        # screen) to let lower pieces overlap the ones above them.
+        for row, col, piece in sorted(self.engine.iter_pieces(), key=_by_col):
+            if (row, col) in skip:
+                continue
+            px, py = self.piece_pixel_pos(row, col)
+            if any_check:
+                dx, dy = self._tremor_offset(piece)
+                px, py = px + dx, py + dy
+            self.screen.blit(self.assets.get_piece_sprite(piece), (px, py))
 
         if self.animating:
             self._draw_animated_piece()
 
-        self.particles.draw(self.screen)
+        if len(self.particles):
+            self.particles.draw(self.screen)
 
         if self.dragging and self.drag_origin is not None:
             piece = self.engine.get_piece(*self.drag_origin)
             if piece is not None:
-                sprite = self.assets.get_piece_sprite(piece).copy()
-                sprite.set_alpha(ALPHA_DRAG_PIECE)
                 self.screen.blit(
-                    sprite,
+                    self.assets.get_drag_sprite(piece),
                     (self.drag_piece_pos[0] - PIECE_WIDTH // 2,
                      self.drag_piece_pos[1] - PIECE_HEIGHT // 2),
                 )
 
-    def _tremor_offset(self, row: int, col: int) -> tuple[int, int]:
-        piece = self.engine.get_piece(row, col)
-        if not isinstance(piece, King) or not self.engine.is_in_check(piece.color):
+    def _tremor_offset(self, piece) -> tuple[int, int]:
+        if piece.KIND != KING or not self._check_cache[piece.color]:
             return (0, 0)
-        t = time.monotonic()
-        dx = int(math.sin(t * TREMOR_FREQUENCY * 2 * math.pi) * TREMOR_AMPLITUDE)
-        dy = int(math.cos(t * TREMOR_FREQUENCY * 2 * math.pi * 0.7) * TREMOR_AMPLITUDE)
-        return (dx, dy)
+        return _TREMOR_LUT[int(self._frame_time / _TREMOR_CYCLE * _TREMOR_STEPS) % _TREMOR_STEPS]
 
     # -------------------------------------------------------------------------
     # Border / labels
     # -------------------------------------------------------------------------
 
-    def _draw_border(self) -> None:
+    def _build_static_bg(self) -> pygame.Surface:
+        """Border, checkerboard, separator strip and coordinate labels; none of them change."""
+        bg = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT))
+        bg.fill(COLOR_BORDER)
+        for row in range(8):
+            for col in range(8):
+                base = COLOR_LIGHT_SQUARE if (row + col) % 2 == 0 else COLOR_DARK_SQUARE
+                pygame.draw.rect(bg, base, (*self.tile_to_pixel(row, col), TILE_W, TILE_H))
         line_y = BOARD_ORIGIN_Y + BOARD_H
-        pygame.draw.rect(self.screen, (0x30, 0x20, 0x10), (BOARD_ORIGIN_X, line_y, BOARD_W, UNIT // 2))
+        pygame.draw.rect(bg, (0x30, 0x20, 0x10), (BOARD_ORIGIN_X, line_y, BOARD_W, UNIT // 2))
+        self._draw_border_rank_numbers_top(bg)
+        self._draw_border_labels(bg)
+        return bg.convert()
 
+    def _draw_border(self) -> None:
+        line_y = BOARD_ORIGIN_Y + BOARD_H
         turn_text = f"{self.engine.turn.upper()} TO MOVE"
         tw = self.font.text_width(turn_text)
         label_y = line_y + BORDER_BOTTOM - FONT_CHAR_HEIGHT * FONT_SCALE - UNIT * 2
         label_x = BOARD_ORIGIN_X + BOARD_W - tw - UNIT * 2
         self.font.render(self.screen, turn_text, label_x, label_y)
 
-    def _draw_border_rank_numbers_top(self) -> None:
+    def _draw_border_rank_numbers_top(self, surface: pygame.Surface) -> None:
         cw, ch = self.font.char_w, self.font.char_h
         cy = (BORDER_TOP - ch) // 2
         for r in range(8):
             label = str(8 - r)
             cx = BOARD_ORIGIN_X + (7 - r) * TILE_W + (TILE_W - cw) // 2
-            self.font.render(self.screen, label, cx, cy, COLOR_LABEL)
+            self.font.render(surface, label, cx, cy, COLOR_LABEL)
 
-    def _draw_border_labels(self) -> None:
+    def _draw_border_labels(self, surface: pygame.Surface) -> None:
         cw, ch = self.font.char_w, self.font.char_h
 
         for c in range(8):
             letter = chr(ord('a') + c)
             cy = BOARD_ORIGIN_Y + c * TILE_H + (TILE_H - ch) // 2
-            self.font.render(self.screen, letter, (BORDER_SIDE - cw) // 2, cy, COLOR_LABEL)
+            self.font.render(surface, letter, (BORDER_SIDE - cw) // 2, cy, COLOR_LABEL)
             cx_right = BOARD_ORIGIN_X + BOARD_W + (BORDER_SIDE - cw) // 2
-            self.font.render(self.screen, letter, cx_right, cy, COLOR_LABEL)
+            self.font.render(surface, letter, cx_right, cy, COLOR_LABEL)
 
         cy_bot = BOARD_ORIGIN_Y + BOARD_H + UNIT * 2
         for r in range(8):
             label = str(8 - r)
             cx = BOARD_ORIGIN_X + (7 - r) * TILE_W + (TILE_W - cw) // 2
-            self.font.render(self.screen, label, cx, cy_bot, COLOR_LABEL)
+            self.font.render(surface, label, cx, cy_bot, COLOR_LABEL)
 
     # -------------------------------------------------------------------------
     # Overlays
@@ -427,9 +532,7 @@ class ChessGUI:
         panel_x = (WINDOW_WIDTH - panel_w) // 2
         panel_y = (WINDOW_HEIGHT - panel_h) // 2
 
-        dim = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT), pygame.SRCALPHA)
-        dim.fill((0, 0, 0, 160))
-        self.screen.blit(dim, (0, 0))
+        self.screen.blit(self._dim_surface, (0, 0))
 
         pygame.draw.rect(self.screen, COLOR_PROMO_BG, (panel_x, panel_y, panel_w, panel_h))
         pygame.draw.rect(self.screen, COLOR_PROMO_BORDER, (panel_x, panel_y, panel_w, panel_h), 2 * UNIT)
@@ -447,9 +550,7 @@ class ChessGUI:
         if not self.game_over:
             return
 
-        overlay = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT), pygame.SRCALPHA)
-        overlay.fill((*COLOR_OVERLAY_BG, ALPHA_OVERLAY))
-        self.screen.blit(overlay, (0, 0))
+        self.screen.blit(self._game_over_surface, (0, 0))
 
         line_h = FONT_CHAR_HEIGHT * FONT_SCALE
         tx = (WINDOW_WIDTH - self.font.text_width(self.game_over_msg)) // 2
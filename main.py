@@ -6,12 +6,21 @@ from assets import AssetManager
 from gui import ChessGUI
 from constants import WINDOW_WIDTH, WINDOW_HEIGHT, TARGET_FPS
 
+# The only event types the game reacts to; SDL drops everything else.
+# VIDEOEXPOSE makes the GUI repaint the whole window after it was covered.
+_EVENT_TYPES = [
+    pygame.QUIT, pygame.KEYDOWN, pygame.VIDEOEXPOSE,
+    pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP, pygame.MOUSEMOTION,
+]
+
 
 def main() -> None:
     pygame.init()
     pygame.mixer.init()
     pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
     pygame.display.set_caption("Chess")
+    pygame.event.set_blocked(None)
+    pygame.event.set_allowed(_EVENT_TYPES)
 
     engine = ChessEngine()
     assets = AssetManager()
@@ -21,7 +30,8 @@ def main() -> None:
     clock = pygame.time.Clock()
 
     while True:
-        for event in pygame.event.get():
+        pygame.event.pump()
+        for event in pygame.event.get(_EVENT_TYPES, pump=False):
             if event.type == pygame.QUIT:
                 pygame.quit()
                 sys.exit()
@@ -1,9 +1,11 @@
-import math
-import random
-import time
-
+import numpy as np
 import pygame
 
+try:
+    from numba import njit
+except ImportError:  # optional; update() falls back to NumPy expressions
+    njit = None
+
 from constants import (
     PARTICLE_COUNT, PARTICLE_SPEED_MIN, PARTICLE_SPEED_MAX,
     PARTICLE_LIFETIME, PARTICLE_SIZE, TILE_W, TILE_H,
@@ -14,58 +16,116 @@ _PALETTES = {
     "black": [(0x44, 0x22, 0x11), (0x88, 0x44, 0x22), (0xCC, 0x66, 0x22), (0xFF, 0x88, 0x00)],
 }
 
+# Every palette entry in one flat table; particles store an index into it.
+_COLORS = _PALETTES["white"] + _PALETTES["black"]
+_PALETTE_START = {"white": 0, "black": len(_PALETTES["white"])}
 
-class Particle:
-    def __init__(self, x: float, y: float, vx: float, vy: float, color: tuple):
-        self.x = x
-        self.y = y
-        self.vx = vx
-        self.vy = vy
-        self.color = color
-        self.born = time.monotonic()
-        self.alpha = 255
+_GRAVITY = 420
 
-    @property
-    def alive(self) -> bool:
-        return (time.monotonic() - self.born) < PARTICLE_LIFETIME
+# Per-particle arrays, kept the same length and compacted together.
+_FIELDS = ("x", "y", "vx", "vy", "age", "color", "alpha")
+_DTYPES = {
+    "x": np.float32, "y": np.float32, "vx": np.float32, "vy": np.float32,
+    "age": np.float32, "color": np.uint8, "alpha": np.uint8,
+}
 
-    def update(self, dt: float) -> None:
-        self.x += self.vx * dt
-        self.y += self.vy * dt
-        self.vy += 420 * dt
-        age = time.monotonic() - self.born
-        self.alpha = int(255 * (1.0 - age / PARTICLE_LIFETIME))
+_rng = np.random.default_rng()
 
-    def draw(self, surface: pygame.Surface) -> None:
-        r, g, b = self.color
-        surf = pygame.Surface((PARTICLE_SIZE, PARTICLE_SIZE), pygame.SRCALPHA)
-        surf.fill((r, g, b, max(0, self.alpha)))
-        surface.blit(surf, (int(self.x), int(self.y)))
+
+if njit is not None:
+    @njit(cache=True, fastmath=True)
+    def _tick(x, y, vx, vy, age, dt, alpha):
+        for i in range(x.size):
+            x[i] += vx[i] * dt
+            y[i] += vy[i] * dt
+            vy[i] += _GRAVITY * dt
+            a = 255.0 * (1.0 - age[i] / PARTICLE_LIFETIME)
+            alpha[i] = int(min(max(a, 0.0), 255.0))
+
+    # Compile at import rather than on the first capture.
+    _one = np.zeros(1, np.float32)
+    _tick(_one, _one.copy(), _one.copy(), _one.copy(), _one.copy(), 0.0, np.zeros(1, np.uint8))
+    del _one
+else:
+    _tick = None
 
 
 class ParticleSystem:
+    """Capture debris stored as parallel NumPy arrays, one entry per particle."""
+
     def __init__(self):
-        self.particles: list[Particle] = []
+        for name in _FIELDS:
+            setattr(self, name, np.empty(0, _DTYPES[name]))
+        # One opaque square per palette colour; fading uses per-surface alpha.
+        self._sprites = []
+        for rgb in _COLORS:
+            sprite = pygame.Surface((PARTICLE_SIZE, PARTICLE_SIZE))
+            sprite.fill(rgb)
+            self._sprites.append(sprite.convert())
+
+    def __len__(self) -> int:
+        return self.x.size
 
     def spawn_capture(self, tile_px: tuple[int, int], captured_color: str) -> None:
         cx = tile_px[0] + TILE_W // 2
         cy = tile_px[1] + TILE_H // 2
-        palette = _PALETTES.get(captured_color, _PALETTES["white"])
+        first = _PALETTE_START.get(captured_color, 0)
+        n = PARTICLE_COUNT
 
-        for _ in range(PARTICLE_COUNT):
-            angle = random.uniform(0, 2 * math.pi)
-            speed = random.uniform(PARTICLE_SPEED_MIN * TILE_W, PARTICLE_SPEED_MAX * TILE_W)
-            vx = math.cos(angle) * speed
-            vy = math.sin(angle) * speed - TILE_H * 1.5
-            ox = random.randint(-TILE_W // 4, TILE_W // 4)
-            oy = random.randint(-TILE_H // 4, TILE_H // 4)
-            self.particles.append(Particle(cx + ox, cy + oy, vx, vy, random.choice(palette)))
+        angle = _rng.uniform(0, 2 * np.pi, n)
+        speed = _rng.uniform(PARTICLE_SPEED_MIN * TILE_W, PARTICLE_SPEED_MAX * TILE_W, n)
+        new = {
+            "x": cx + _rng.integers(-TILE_W // 4, TILE_W // 4, n, endpoint=True),
+            "y": cy + _rng.integers(-TILE_H // 4, TILE_H // 4, n, endpoint=True),
+            "vx": np.cos(angle) * speed,
+            "vy": np.sin(angle) * speed - TILE_H * 1.5,
+            "age": np.zeros(n),
+            "color": first + _rng.integers(0, len(_PALETTES["white"]), n),
+            "alpha": np.full(n, 255),
+        }
+        for name in _FIELDS:
+            grown = np.concatenate((getattr(self, name), new[name].astype(_DTYPES[name])))
+            setattr(self, name, grown)
 
     def update(self, dt: float) -> None:
-        self.particles = [p for p in self.particles if p.alive]
-        for p in self.particles:
-            p.update(dt)
+        if not self.x.size:
+            return
+        self.age += dt
+        alive = self.age < PARTICLE_LIFETIME
+        if not alive.all():
+            for name in _FIELDS:
+                setattr(self, name, getattr(self, name)[alive])
+
+        if _tick is not None:
+            _tick(self.x, self.y, self.vx, self.vy, self.age, dt, self.alpha)
+            return
+        self.x += self.vx * dt
+        self.y += self.vy * dt
+        self.vy += _GRAVITY * dt
+        self.alpha = np.clip(255 * (1.0 - self.age / PARTICLE_LIFETIME), 0, 255).astype(np.uint8)
+
+    def bounds(self) -> pygame.Rect | None:
+        """Rectangle covering every live particle, or None when there are none."""
+        if not self.x.size:
+            return None
+        x0, y0 = int(self.x.min()), int(self.y.min())
+        return pygame.Rect(
+            x0, y0,
+            int(self.x.max()) - x0 + PARTICLE_SIZE, int(self.y.max()) - y0 + PARTICLE_SIZE,
+        )
 
     def draw(self, surface: pygame.Surface) -> None:
-        for p in self.particles:
-            p.draw(surface)
+        if not self.x.size:
+            return
+        xs = self.x.astype(np.int32)
+        ys = self.y.astype(np.int32)
+        # set_alpha applies to a whole sprite, so blit each (colour, alpha) group in one batch.
+        keys = (self.color.astype(np.uint16) << 8) | self.alpha
+        for key in np.unique(keys).tolist():
+            group = keys == key
+            sprite = self._sprites[key >> 8]
+            sprite.set_alpha(key & 0xFF)
+            surface.blits(
+                [(sprite, pos) for pos in zip(xs[group].tolist(), ys[group].tolist())],
+                doreturn=False,
+            )
@@ -1,9 +1,10 @@
 import pytest
+import copy
 import sys, os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 
 from chess.engine import ChessEngine
-from chess.pieces import King, Queen, Rook, Knight, Bishop, Pawn
+from chess.pieces import King, Queen, Rook, Knight, Bishop, Pawn, WK, WQ, BK, BQ
 
 
 @pytest.fixture
@@ -21,7 +22,7 @@ def test_pawn_has_two_opening_moves(engine):
 
 
 def test_pawn_blocked_by_own_piece(engine):
-    engine.board[5][0] = Pawn("white")
+    engine.set_piece(5, 0, Pawn("white"))
     moves = engine.get_legal_moves(6, 0)
     assert (5, 0) not in moves
 
@@ -63,45 +64,245 @@ def test_en_passant_target_cleared_on_next_move(engine):
 
 def test_castling_rights_revoked_after_king_move(engine):
     # Clear squares between king and rook
-    engine.board[7][5] = None
-    engine.board[7][6] = None
+    engine.set_piece(7, 5, None)
+    engine.set_piece(7, 6, None)
     engine.move_piece((7, 4), (7, 6))  # kingside castle
-    assert not engine.castling_rights["white"]["kingside"]
-    assert not engine.castling_rights["white"]["queenside"]
+    assert not engine.castling_mask & (WK | WQ)
+    assert engine.castling_mask == BK | BQ
 
 
 def test_promotion_required_flag(engine):
     # Place white pawn one step from promotion
-    engine.board[1][0] = Pawn("white")
-    engine.board[0][0] = None  # clear the black rook
+    engine.set_piece(1, 0, Pawn("white"))
+    engine.set_piece(0, 0, None)  # clear the black rook
     result = engine.move_piece((1, 0), (0, 0))
     assert result["promotion_required"] is True
     assert result["promotion_square"] == (0, 0)
 
 
 def test_promote_pawn_replaces_piece(engine):
-    engine.board[0][0] = Pawn("white")
+    engine.set_piece(0, 0, Pawn("white"))
     engine.promote_pawn(0, 0, "queen")
-    assert isinstance(engine.board[0][0], Queen)
+    assert isinstance(engine.get_piece(0, 0), Queen)
 
 
 def test_promote_pawn_invalid_type_raises(engine):
-    engine.board[0][0] = Pawn("white")
+    engine.set_piece(0, 0, Pawn("white"))
     with pytest.raises(ValueError):
         engine.promote_pawn(0, 0, "dragon")
 
 
+def test_promote_pawn_requires_lowercase_type(engine):
+    engine.set_piece(0, 0, Pawn("white"))
+    with pytest.raises(ValueError):
+        engine.promote_pawn(0, 0, "Queen")
+
+
 def test_move_into_check_is_illegal(engine):
     """A move that exposes the king to check must not appear in legal moves."""
     # Isolate: put white king in a vulnerable position by hand
-    engine.board = [[None] * 8 for _ in range(8)]
-    engine.board[7][4] = King("white")
-    engine.board[7][3] = Rook("white")  # pinned rook
-    engine.board[7][0] = Rook("black")  # attacker along rank 7
-    engine.board[0][4] = King("black")
+    engine.clear_board()
+    engine.set_piece(7, 4, King("white"))
+    engine.set_piece(7, 3, Rook("white"))  # pinned rook
+    engine.set_piece(7, 0, Rook("black"))  # attacker along rank 7
+    engine.set_piece(0, 4, King("black"))
 
     legal = engine.get_legal_moves(7, 3)
     # The pinned rook must not move off rank 7 (that would expose the king)
     off_rank = [(r, 3) for r in range(7) if r != 7]
     for sq in off_rank:
         assert sq not in legal
+
+
+def test_clear_board_drops_castling_and_en_passant(engine):
+    engine.move_piece((6, 4), (4, 4))
+    engine.clear_board()
+    assert engine.castling_mask == 0
+    assert engine.en_passant_target is None
+    assert engine.promotion_pending is None
+    engine.set_piece(7, 4, King("white"))
+    engine.set_piece(7, 7, Rook("white"))
+    assert (7, 6) not in engine.get_legal_moves(7, 4)
+
+
+def test_bitboards_match_starting_board(engine):
+    assert engine.bb["white_P"] == 0xFF << 48
+    assert engine.bb["black_P"] == 0xFF << 8
+    assert engine.occ == (0xFFFF << 48) | 0xFFFF
+
+
+def test_bitboards_follow_moves(engine):
+    engine.move_piece((6, 4), (4, 4))
+    assert engine.bb["white_P"] & (1 << (4 * 8 + 4))
+    assert not engine.occ & (1 << (6 * 8 + 4))
+
+
+def _perft(engine, depth):
+    if depth == 0:
+        return 1
+    total = 0
+    for r in range(8):
+        for c in range(8):
+            for move in engine.get_legal_moves(r, c):
+                child = copy.deepcopy(engine)
+                child.move_piece((r, c), move)
+                total += _perft(child, depth - 1)
+    return total
+
+
+def test_perft_from_start(engine):
+    assert _perft(engine, 3) == 8902
+
+
+def test_pinned_rook_may_slide_along_the_pin(engine):
+    engine.clear_board()
+    engine.set_piece(7, 4, King("white"))
+    engine.set_piece(7, 2, Rook("white"))
+    engine.set_piece(7, 0, Rook("black"))
+    engine.set_piece(0, 4, King("black"))
+    assert sorted(engine.get_legal_moves(7, 2)) == [(7, 0), (7, 1), (7, 3)]
+
+
+def test_only_blocks_or_captures_answer_a_check(engine):
+    engine.clear_board()
+    engine.set_piece(7, 4, King("white"))
+    engine.set_piece(7, 1, Knight("white"))
+    engine.set_piece(6, 0, Queen("white"))
+    engine.set_piece(3, 4, Rook("black"))
+    engine.set_piece(0, 0, King("black"))
+    assert engine.get_legal_moves(7, 1) == []
+    assert engine.get_legal_moves(6, 0) == [(6, 4)]
+
+
+def test_en_passant_exposing_king_on_rank_is_illegal(engine):
+    engine.clear_board()
+    engine.set_piece(3, 0, King("white"))
+    engine.set_piece(3, 4, Pawn("white"))
+    engine.set_piece(3, 7, Rook("black"))
+    engine.set_piece(1, 5, Pawn("black"))
+    engine.set_piece(0, 0, King("black"))
+    engine.turn = "black"
+    engine.move_piece((1, 5), (3, 5))
+    assert (2, 5) not in engine.get_legal_moves(3, 4)
+
+
+def test_attackers_to_sees_each_piece_type(engine):
+    engine.clear_board()
+    engine.set_piece(4, 4, Pawn("black"))
+    engine.set_piece(0, 0, Bishop("black"))
+    engine.set_piece(7, 1, Knight("black"))
+    engine.set_piece(0, 7, King("black"))
+    engine.set_piece(7, 7, Rook("black"))
+    engine.set_piece(4, 0, Queen("black"))
+
+    def attacked(row, col):
+        return engine.attackers_to(row * 8 + col, "black", engine.occ)
+
+    # Each square below is reached by exactly one of the pieces.
+    assert attacked(5, 3)      # pawn
+    assert not attacked(5, 4)  # pawn push square
+    assert attacked(3, 3)      # bishop
+    assert not attacked(6, 6)  # behind the pawn
+    assert attacked(5, 2)      # knight
+    assert attacked(1, 6)      # king
+    assert attacked(3, 7)      # rook
+    assert attacked(1, 3)      # queen
+
+
+def test_castling_moves_rook_bitboard(engine):
+    engine.set_piece(7, 5, None)
+    engine.set_piece(7, 6, None)
+    engine.move_piece((7, 4), (7, 6))
+    assert engine.bb["white_R"] == (1 << 56) | (1 << 61)
+    assert engine.bb["white_K"] == 1 << 62
+    assert not engine.occ & (1 << 63)
+
+
+def test_find_king_square_follows_king(engine):
+    assert engine.find_king_square("white") == (7, 4)
+    engine.move_piece((6, 4), (4, 4))
+    engine.move_piece((1, 0), (2, 0))
+    engine.move_piece((7, 4), (6, 4))
+    assert engine.find_king_square("white") == (6, 4)
+
+
+def test_find_king_square_without_king(engine):
+    engine.clear_board()
+    assert engine.find_king_square("black") is None
+
+
+def test_iter_pieces_yields_occupied_squares_only(engine):
+    pieces = list(engine.iter_pieces())
+    assert len(pieces) == 32
+    assert all(engine.get_piece(r, c) is p for r, c, p in pieces)
+    engine.clear_board()
+    engine.set_piece(3, 5, Knight("black"))
+    assert [(r, c) for r, c, _ in engine.iter_pieces()] == [(3, 5)]
+
+
+def test_legal_moves_cache_dropped_when_board_changes(engine):
+    assert len(engine.get_legal_moves(6, 4)) == 2
+    engine.set_piece(4, 4, Knight("black"))
+    assert engine.get_legal_moves(6, 4) == [(5, 4)]
+
+
+def test_legal_moves_cache_dropped_after_move(engine):
+    assert engine.get_legal_moves(7, 5) == []
+    engine.move_piece((6, 4), (4, 4))
+    engine.move_piece((1, 0), (2, 0))
+    assert len(engine.get_legal_moves(7, 5)) == 5
+
+
+def test_back_rank_checkmate(engine):
+    engine.clear_board()
+    engine.set_piece(0, 6, King("black"))
+    for col in (5, 6, 7):
+        engine.set_piece(1, col, Pawn("black"))
+    engine.set_piece(0, 0, Rook("white"))
+    engine.set_piece(7, 4, King("white"))
+    engine.turn = "black"
+    assert engine.is_checkmate("black")
+    assert not engine.is_stalemate("black")
+    assert not engine.has_legal_move("black")
+    assert engine.has_legal_move("white")
+
+
+def test_lone_king_stalemate(engine):
+    engine.clear_board()
+    engine.set_piece(0, 7, King("black"))
+    engine.set_piece(2, 6, Queen("white"))
+    engine.set_piece(7, 0, King("white"))
+    engine.turn = "black"
+    assert engine.is_stalemate("black")
+    assert not engine.is_checkmate("black")
+
+
+def test_rook_move_revokes_one_side(engine):
+    engine.set_piece(6, 7, None)
+    engine.move_piece((7, 7), (5, 7))
+    assert engine.castling_mask == WQ | BK | BQ
+    assert engine.move_log[-1]["castling_mask_before"] == WK | WQ | BK | BQ
+
+
+def test_rook_move_off_home_rank_keeps_rights(engine):
+    engine.clear_board()
+    engine.castling_mask = WK | WQ
+    engine.set_piece(7, 4, King("white"))
+    engine.set_piece(4, 7, Rook("white"))
+    engine.move_piece((4, 7), (4, 0))
+    assert engine.castling_mask == WK | WQ
+
+
+def test_capture_on_corner_revokes_castling_for_good(engine):
+    engine.clear_board()
+    engine.castling_mask = WK | WQ
+    engine.set_piece(7, 4, King("white"))
+    engine.set_piece(7, 7, Rook("white"))
+    engine.set_piece(5, 7, Rook("white"))
+    engine.set_piece(4, 4, Bishop("black"))
+    engine.set_piece(0, 0, King("black"))
+    engine.move_piece((4, 4), (7, 7))  # bishop takes the h1 rook
+    assert engine.castling_mask == WQ
+    engine.move_piece((5, 7), (7, 7))  # a different rook retakes on h1
+    assert engine.castling_mask == WQ
+    assert (7, 6) not in engine.get_legal_moves(7, 4)
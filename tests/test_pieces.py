@@ -3,17 +3,13 @@ import sys, os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 
 from chess.engine import ChessEngine
-from chess.pieces import Pawn, Rook, Knight, Bishop, Queen, King
+from chess.pieces import Pawn, Rook, Knight, Bishop, Queen, King, WK, WQ
 
 
 def blank_engine():
     """Engine with an empty board and white to move."""
     e = ChessEngine()
-    e.board = [[None] * 8 for _ in range(8)]
-    e.castling_rights = {
-        "white": {"kingside": False, "queenside": False},
-        "black": {"kingside": False, "queenside": False},
-    }
+    e.clear_board()
     return e
 
 
@@ -23,76 +19,92 @@ def blank_engine():
 
 def test_pawn_single_push():
     e = blank_engine()
-    e.board[4][4] = Pawn("white")
-    moves = e.board[4][4].get_moves(e, 4, 4)
+    e.set_piece(4, 4, Pawn("white"))
+    moves = e.get_piece(4, 4).get_moves(e, 4, 4)
     assert (3, 4) in moves
 
 
 def test_pawn_double_push_from_start():
     e = blank_engine()
-    e.board[6][4] = Pawn("white")
-    moves = e.board[6][4].get_moves(e, 6, 4)
+    e.set_piece(6, 4, Pawn("white"))
+    moves = e.get_piece(6, 4).get_moves(e, 6, 4)
     assert (4, 4) in moves
 
 
 def test_pawn_double_push_blocked():
     e = blank_engine()
-    e.board[6][4] = Pawn("white")
-    e.board[5][4] = Pawn("black")
-    moves = e.board[6][4].get_moves(e, 6, 4)
+    e.set_piece(6, 4, Pawn("white"))
+    e.set_piece(5, 4, Pawn("black"))
+    moves = e.get_piece(6, 4).get_moves(e, 6, 4)
     assert (4, 4) not in moves
     assert (5, 4) not in moves
 
 
 def test_pawn_diagonal_capture():
     e = blank_engine()
-    e.board[4][4] = Pawn("white")
-    e.board[3][5] = Pawn("black")
-    moves = e.board[4][4].get_moves(e, 4, 4)
+    e.set_piece(4, 4, Pawn("white"))
+    e.set_piece(3, 5, Pawn("black"))
+    moves = e.get_piece(4, 4).get_moves(e, 4, 4)
     assert (3, 5) in moves
 
 
 def test_pawn_cannot_capture_friendly():
     e = blank_engine()
-    e.board[4][4] = Pawn("white")
-    e.board[3][5] = Pawn("white")
-    moves = e.board[4][4].get_moves(e, 4, 4)
+    e.set_piece(4, 4, Pawn("white"))
+    e.set_piece(3, 5, Pawn("white"))
+    moves = e.get_piece(4, 4).get_moves(e, 4, 4)
     assert (3, 5) not in moves
 
 
 def test_pawn_en_passant():
     e = blank_engine()
-    e.board[3][4] = Pawn("white")
+    e.set_piece(3, 4, Pawn("white"))
     e.en_passant_target = (2, 5)
-    moves = e.board[3][4].get_moves(e, 3, 4)
+    moves = e.get_piece(3, 4).get_moves(e, 3, 4)
     assert (2, 5) in moves
 
 
+def test_pawn_capture_does_not_wrap_files():
+    e = blank_engine()
+    e.set_piece(4, 0, Pawn("white"))
+    e.set_piece(2, 7, Pawn("black"))
+    moves = e.get_piece(4, 0).get_moves(e, 4, 0)
+    assert moves == [(3, 0)]
+
+
+def test_black_pawn_moves_down_the_board():
+    e = blank_engine()
+    e.set_piece(1, 3, Pawn("black"))
+    e.set_piece(2, 4, Knight("white"))
+    moves = e.get_piece(1, 3).get_moves(e, 1, 3)
+    assert sorted(moves) == [(2, 3), (2, 4), (3, 3)]
+
+
 # ---------------------------------------------------------------------------
 # Rook
 # ---------------------------------------------------------------------------
 
 def test_rook_open_file():
     e = blank_engine()
-    e.board[4][4] = Rook("white")
-    moves = e.board[4][4].get_moves(e, 4, 4)
+    e.set_piece(4, 4, Rook("white"))
+    moves = e.get_piece(4, 4).get_moves(e, 4, 4)
     assert len(moves) == 14  # 7 along rank + 7 along file
 
 
 def test_rook_blocked_by_friendly():
     e = blank_engine()
-    e.board[4][4] = Rook("white")
-    e.board[4][6] = Rook("white")
-    moves = e.board[4][4].get_moves(e, 4, 4)
+    e.set_piece(4, 4, Rook("white"))
+    e.set_piece(4, 6, Rook("white"))
+    moves = e.get_piece(4, 4).get_moves(e, 4, 4)
     assert (4, 6) not in moves
     assert (4, 7) not in moves
 
 
 def test_rook_can_capture_enemy():
     e = blank_engine()
-    e.board[4][4] = Rook("white")
-    e.board[4][6] = Rook("black")
-    moves = e.board[4][4].get_moves(e, 4, 4)
+    e.set_piece(4, 4, Rook("white"))
+    e.set_piece(4, 6, Rook("black"))
+    moves = e.get_piece(4, 4).get_moves(e, 4, 4)
     assert (4, 6) in moves
     assert (4, 7) not in moves
 
@@ -103,27 +115,27 @@ def test_rook_can_capture_enemy():
 
 def test_knight_center_has_eight_moves():
     e = blank_engine()
-    e.board[4][4] = Knight("white")
-    moves = e.board[4][4].get_moves(e, 4, 4)
+    e.set_piece(4, 4, Knight("white"))
+    moves = e.get_piece(4, 4).get_moves(e, 4, 4)
     assert len(moves) == 8
 
 
 def test_knight_corner_has_two_moves():
     e = blank_engine()
-    e.board[0][0] = Knight("white")
-    moves = e.board[0][0].get_moves(e, 0, 0)
+    e.set_piece(0, 0, Knight("white"))
+    moves = e.get_piece(0, 0).get_moves(e, 0, 0)
     assert len(moves) == 2
 
 
 def test_knight_jumps_over_pieces():
     e = blank_engine()
-    e.board[4][4] = Knight("white")
+    e.set_piece(4, 4, Knight("white"))
     # Fill all adjacent squares — knight should still have 8 moves
     for dr in (-1, 0, 1):
         for dc in (-1, 0, 1):
             if dr != 0 or dc != 0:
-                e.board[4 + dr][4 + dc] = Pawn("white")
-    moves = e.board[4][4].get_moves(e, 4, 4)
+                e.set_piece(4 + dr, 4 + dc, Pawn("white"))
+    moves = e.get_piece(4, 4).get_moves(e, 4, 4)
     assert len(moves) == 8
 
 
@@ -133,19 +145,31 @@ def test_knight_jumps_over_pieces():
 
 def test_bishop_open_diagonal():
     e = blank_engine()
-    e.board[4][4] = Bishop("white")
-    moves = e.board[4][4].get_moves(e, 4, 4)
+    e.set_piece(4, 4, Bishop("white"))
+    moves = e.get_piece(4, 4).get_moves(e, 4, 4)
     assert len(moves) == 13
 
 
+def test_bishop_stops_at_first_blocker():
+    e = blank_engine()
+    e.set_piece(4, 4, Bishop("white"))
+    e.set_piece(2, 2, Pawn("black"))
+    e.set_piece(6, 6, Pawn("white"))
+    moves = e.get_piece(4, 4).get_moves(e, 4, 4)
+    assert (2, 2) in moves
+    assert (1, 1) not in moves
+    assert (6, 6) not in moves
+    assert (5, 5) in moves
+
+
 # ---------------------------------------------------------------------------
 # Queen
 # ---------------------------------------------------------------------------
 
 def test_queen_open_board():
     e = blank_engine()
-    e.board[4][4] = Queen("white")
-    moves = e.board[4][4].get_moves(e, 4, 4)
+    e.set_piece(4, 4, Queen("white"))
+    moves = e.get_piece(4, 4).get_moves(e, 4, 4)
     assert len(moves) == 27  # 14 rook + 13 bishop
 
 
@@ -155,14 +179,50 @@ def test_queen_open_board():
 
 def test_king_center_moves():
     e = blank_engine()
-    e.board[4][4] = King("white")
-    moves = e.board[4][4].get_moves(e, 4, 4)
+    e.set_piece(4, 4, King("white"))
+    moves = e.get_piece(4, 4).get_moves(e, 4, 4)
     assert len(moves) == 8
 
 
 def test_king_cannot_move_to_friendly_square():
     e = blank_engine()
-    e.board[4][4] = King("white")
-    e.board[3][4] = Pawn("white")
-    moves = e.board[4][4].get_moves(e, 4, 4)
+    e.set_piece(4, 4, King("white"))
+    e.set_piece(3, 4, Pawn("white"))
+    moves = e.get_piece(4, 4).get_moves(e, 4, 4)
     assert (3, 4) not in moves
+
+
+def test_king_castles_only_through_empty_squares():
+    e = blank_engine()
+    e.castling_mask = WK | WQ
+    e.set_piece(7, 4, King("white"))
+    e.set_piece(7, 0, Rook("white"))
+    e.set_piece(7, 7, Rook("white"))
+    e.set_piece(7, 1, Knight("white"))
+    moves = e.get_piece(7, 4).get_moves(e, 7, 4)
+    assert (7, 6) in moves
+    assert (7, 2) not in moves
+
+
+def test_king_cannot_castle_without_its_rook():
+    e = blank_engine()
+    e.castling_mask = WK | WQ
+    e.set_piece(7, 4, King("white"))
+    e.set_piece(7, 7, Knight("black"))
+    moves = e.get_piece(7, 4).get_moves(e, 7, 4)
+    assert (7, 6) not in moves
+    assert (7, 2) not in moves
+
+
+# ---------------------------------------------------------------------------
+# General
+# ---------------------------------------------------------------------------
+
+def test_sprite_key_matches_asset_name():
+    assert Knight("black").sprite_key == "black_knight"
+    assert Queen("white").sprite_key == "white_queen"
+
+
+def test_pieces_have_no_instance_dict():
+    for cls in (Pawn, Rook, Knight, Bishop, Queen, King):
+        assert not hasattr(cls("white"), "__dict__")